@@ -1,29 +1,65 @@
+import asyncio
+import atexit
+import os
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from arduino.app_utils import App
 from arduino.app_bricks.web_ui import WebUI
 from arduino.app_bricks.video_objectdetection import VideoObjectDetection
 
+# This app is mostly waiting on I/O, so hand the GIL over less often
+# (default is 0.005 s). Free-threaded Python (3.13t) has no GIL to tune.
+GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+if GIL_ENABLED:
+    sys.setswitchinterval(0.02)
+
 # Update this path after checking /sys/class/leds on your board
 myLedGreenPath = "/sys/class/leds/green:wlan/brightness"
 
+# Open each sysfs file once and keep the file descriptor for reuse
+myLedFds = {}
+
+def myGetLedFd(path):
+    fd = myLedFds.get(path)
+    if fd is None:
+        fd = os.open(path, os.O_WRONLY)
+        myLedFds[path] = fd
+    return fd
+
+# Close all the LED files when the script exits
+atexit.register(lambda: [os.close(fd) for fd in myLedFds.values()])
+
 def mySetLedBrightness(path, value):
     try:
-        with open(path, "w") as f:
-            f.write(str(value))
+        fd = myGetLedFd(path)
+        os.write(fd, str(value).encode())
+        # Rewind so the next write starts at the beginning of the file
+        os.lseek(fd, 0, os.SEEK_SET)
     except Exception as e:
         print("Error writing LED brightness:", e)
 
-# Blink in a separate thread or before the main App run
-# (depending on how App.run() handles blocking)
-import threading
-def blink_loop():
+async def blink_once():
     mySetLedBrightness(myLedGreenPath, 255)
-    time.sleep(0.5)
+    await asyncio.sleep(0.5)
     mySetLedBrightness(myLedGreenPath, 0)
-    time.sleep(0.5)
+    await asyncio.sleep(0.5)  # Stay off too, so repeated blinks are visible
+
+# The detection callback is not called from an asyncio loop, so blinks run
+# on one small background event loop instead of blocking the callback
+_blink_event_loop = asyncio.new_event_loop()
+threading.Thread(target=_blink_event_loop.run_forever, daemon=True).start()
+_blink_task = None
 
-threading.Thread(target=blink_loop, daemon=True).start()
+def start_blink():
+    # Only one blink at a time, so bursts of detections don't queue up blinks
+    global _blink_task
+    if _blink_task is None or _blink_task.done():
+        _blink_task = asyncio.run_coroutine_threadsafe(blink_once(), _blink_event_loop)
+
+start_blink()
 
 # Setup UI & detection
 ui = WebUI()
@@ -32,18 +68,64 @@ detection_stream = VideoObjectDetection(confidence=0.5, debounce_sec=0.0)
 ui.on_message("override_th", lambda sid, threshold: detection_stream.override_threshold(threshold))
 
 def send_detections_to_ui(detections: dict):
+    # One timestamp per frame (isoformat is not free), shared by every entry.
+    # Entries stay one message each to match the App Lab detection UI.
+    timestamp = datetime.now(timezone.utc).isoformat()
     for key, value in detections.items():
         entry = {
             "content": key,
             "confidence": value.get("confidence"),
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": timestamp
         }
         ui.send_message("detection", message=entry)
-        
-        # ✅ Fixed if statement
-        if key == "person":
-            blink_loop()
+    
+    if "person" in detections:
+        start_blink()
+
+# Blocking ratio (beta) of the detection callback: the share of its wall time
+# spent waiting rather than computing, sent to the UI about once a second
+_beta_lock = threading.Lock()
+_beta_wall = 0.0
+_beta_cpu = 0.0
+_beta_last_report = time.monotonic()
+
+def timed_send_detections_to_ui(detections: dict):
+    global _beta_wall, _beta_cpu, _beta_last_report
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    send_detections_to_ui(detections)
+    with _beta_lock:
+        _beta_wall += time.perf_counter() - wall_start
+        _beta_cpu += time.thread_time() - cpu_start
+        if time.monotonic() - _beta_last_report < 1.0 or _beta_wall <= 0:
+            return
+        beta = max(0.0, 1.0 - _beta_cpu / _beta_wall)
+        _beta_wall = _beta_cpu = 0.0
+        _beta_last_report = time.monotonic()
+    ui.send_message("beta", message={"beta": round(beta, 3)})
+
+# Without a GIL, extra threads compete for the few cores instead, so run
+# callbacks on one worker (keeps "detection" messages in order) and drop
+# frames when 8 are already waiting
+MAX_PENDING_DETECTIONS = 8
+_detection_executor = None if GIL_ENABLED else ThreadPoolExecutor(max_workers=1)
+_detection_slots = threading.BoundedSemaphore(MAX_PENDING_DETECTIONS)
+
+def on_detect_all(detections: dict):
+    if _detection_executor is None:
+        timed_send_detections_to_ui(detections)
+        return
+    if not _detection_slots.acquire(blocking=False):
+        return  # Too far behind, skip this frame
+    future = _detection_executor.submit(timed_send_detections_to_ui, detections)
+    future.add_done_callback(detection_done)
+
+def detection_done(future):
+    _detection_slots.release()
+    error = future.exception()
+    if error is not None:
+        print("Error sending detections to UI:", error)
 
-detection_stream.on_detect_all(send_detections_to_ui)
+detection_stream.on_detect_all(on_detect_all)
 
 App.run()
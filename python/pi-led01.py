@@ -1,3 +1,4 @@
+import atexit
 import time
 import os
 
@@ -7,14 +8,31 @@ import os
 myLed1BluePath = "/sys/class/leds/blue:user/brightness"
 myLed2GreenPath = "/sys/class/leds/green:wlan/brightness"
 
+# --- Cached File Descriptors ---
+# Each LED file is opened only once, then the same descriptor is reused
+# for every write (much cheaper than open/write/close each time).
+myLedFds = {}
+
+def myGetLedFd(myLedFilePath):
+    """Returns an open write-only descriptor for the LED file path."""
+    myFd = myLedFds.get(myLedFilePath)
+    if myFd is None:
+        myFd = os.open(myLedFilePath, os.O_WRONLY)
+        myLedFds[myLedFilePath] = myFd
+    return myFd
+
+# Close all the LED files when the script exits
+atexit.register(lambda: [os.close(myFd) for myFd in myLedFds.values()])
+
 # --- Function to Control LED Brightness ---
 # 0 is OFF, 255 is ON (maximum brightness)
 def mySetLedBrightness(myLedFilePath, myValue):
     """Writes a brightness value (0-255) to the specified LED file path."""
     try:
-        # 'w' opens the file for writing
-        with open(myLedFilePath, "w") as myFile:
-            myFile.write(str(myValue))
+        myFd = myGetLedFd(myLedFilePath)
+        os.write(myFd, str(myValue).encode())
+        # Rewind so the next write starts at the beginning of the file
+        os.lseek(myFd, 0, os.SEEK_SET)
     except Exception as myError:
         # You may need to run your script with sufficient permissions (e.g., as root)
         print(f"Error controlling LED at {myLedFilePath}: {myError}. Check permissions.")
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 # Arduino UNO Q - Control all RGB LED colors
+import atexit
+import os
 import time
 
 # GPIO paths for RGB LED on Arduino UNO Q
@@ -7,55 +9,81 @@ LED_R = "/sys/class/leds/led1_r/brightness"
 LED_G = "/sys/class/leds/led1_g/brightness"
 LED_B = "/sys/class/leds/led1_b/brightness"
 
-def set_led(led_path, state):
-    """Set LED state: 1 for on, 0 for off"""
-    with open(led_path, 'w') as led:
-        led.write(str(state))
+# Open each LED file once and reuse the file descriptor
+_LED_FDS = {}
 
-def set_rgb(r, g, b):
-    """Set RGB LED color (1=on, 0=off for each channel)"""
-    set_led(LED_R, r)
-    set_led(LED_G, g)
-    set_led(LED_B, b)
+def _fd(led_path):
+    fd = _LED_FDS.get(led_path)
+    if fd is None:
+        fd = os.open(led_path, os.O_WRONLY)
+        _LED_FDS[led_path] = fd
+    return fd
+
+atexit.register(lambda: [os.close(fd) for fd in _LED_FDS.values()])
+
+def write_led(led_path, data):
+    """Write already-encoded bytes (e.g. b"1") to an LED"""
+    fd = _fd(led_path)
+    os.write(fd, data)
+    os.lseek(fd, 0, os.SEEK_SET)
+
+# Optional: submit the three channel writes as one io_uring batch
+# (pip3 install liburing). Falls back to three plain writes without it.
+try:
+    import liburing
+    _ring = liburing.io_uring()
+    _cqe = liburing.io_uring_cqe()
+    liburing.io_uring_queue_init(8, _ring, 0)
+    atexit.register(liburing.io_uring_queue_exit, _ring)
+except (ImportError, OSError):
+    liburing = None
+
+def set_rgb_bytes(rb, gb, bb):
+    """Set RGB LED color from pre-encoded channel values (b"1"=on, b"0"=off)"""
+    if liburing is None:
+        write_led(LED_R, rb)
+        write_led(LED_G, gb)
+        write_led(LED_B, bb)
+        return
+    
+    # One SQE per channel, written at offset 0 so no rewind is needed.
+    # rb, gb and bb stay referenced here until the writes complete.
+    for led_path, data in ((LED_R, rb), (LED_G, gb), (LED_B, bb)):
+        sqe = liburing.io_uring_get_sqe(_ring)
+        liburing.io_uring_prep_write(sqe, _fd(led_path), data, len(data), 0)
+    liburing.io_uring_submit_and_wait(_ring, 3)
+    errors = []
+    for _ in range(3):
+        liburing.io_uring_wait_cqe(_ring, _cqe)
+        if _cqe.res < 0:
+            errors.append(-_cqe.res)
+        liburing.io_uring_cqe_seen(_ring, _cqe)
+    if errors:
+        raise OSError(errors[0], os.strerror(errors[0]))
+
+# Demo colors, with the channel values encoded once up front
+COLORS = (
+    ("Red",     (b"1", b"0", b"0")),
+    ("Green",   (b"0", b"1", b"0")),
+    ("Blue",    (b"0", b"0", b"1")),
+    ("Yellow",  (b"1", b"1", b"0")),
+    ("Cyan",    (b"0", b"1", b"1")),
+    ("Magenta", (b"1", b"0", b"1")),
+    ("White",   (b"1", b"1", b"1")),
+    ("Off",     (b"0", b"0", b"0")),
+)
 
 print("RGB LED Color Demo on Arduino UNO Q...")
 print("Press Ctrl+C to stop")
 
 try:
     while True:
-        print("Red")
-        set_rgb(1, 0, 0)
-        time.sleep(1)
-        
-        print("Green")
-        set_rgb(0, 1, 0)
-        time.sleep(1)
-        
-        print("Blue")
-        set_rgb(0, 0, 1)
-        time.sleep(1)
-        
-        print("Yellow")
-        set_rgb(1, 1, 0)
-        time.sleep(1)
-        
-        print("Cyan")
-        set_rgb(0, 1, 1)
-        time.sleep(1)
-        
-        print("Magenta")
-        set_rgb(1, 0, 1)
-        time.sleep(1)
-        
-        print("White")
-        set_rgb(1, 1, 1)
-        time.sleep(1)
-        
-        print("Off")
-        set_rgb(0, 0, 0)
-        time.sleep(1)
+        for name, (r, g, b) in COLORS:
+            print(name)
+            set_rgb_bytes(r, g, b)
+            time.sleep(1)
 
 except KeyboardInterrupt:
     print("\nStopping...")
-    set_rgb(0, 0, 0)  # Turn off all LEDs
+    set_rgb_bytes(b"0", b"0", b"0")  # Turn off all LEDs
     print("LEDs off")
@@ -36,8 +36,8 @@ INSTALLATION INSTRUCTIONS:
    # Small model (~2GB, fits on internal storage):
    ollama pull tinyllama
    
-   # Medium model (~4GB, recommended for USB drive):
-   ollama pull codellama:7b-code
+   # Medium model, 4-bit quantized (~4GB, default MODEL_NAME):
+   ollama pull codellama:7b-code-q4_0
    
    # Larger, better model (~8GB, requires USB drive):
    ollama pull deepseek-coder:6.7b
@@ -46,7 +46,10 @@ INSTALLATION INSTRUCTIONS:
 
 4. INSTALL PYTHON DEPENDENCIES:
    
-   pip3 install requests
+   pip3 install aiohttp
+   
+   # Optional, faster JSON encoding/decoding (falls back to json):
+   pip3 install orjson
    
    # If using OpenAI API instead of local model:
    pip3 install openai
@@ -59,13 +62,20 @@ CONFIGURATION OPTIONS:
 ======================
 - Change GENERATION_INTERVAL_SECONDS to adjust how often new sketches are generated
 - Set USE_LOCAL_MODEL to False to use OpenAI API instead
-- Modify MODEL_NAME to use different Ollama models
+- Modify MODEL_NAME to use different Ollama models (quantized tags like
+  -q4_0 or -q8_0 are much faster on the UNO Q CPU than the FP16 weights)
+- Set the OLLAMA_NUM_THREAD environment variable to limit how many CPU
+  threads Ollama uses (defaults to all cores)
+- Set INT8_BACKEND_URL to an OpenAI-compatible server (e.g. vLLM) serving a
+  W8A8 quantized model to use it instead of the OpenAI API
 - Adjust SAFETY_KEYWORDS to filter out dangerous code patterns
 
 """
 
+import asyncio
 import json
 import os
+import random
 import subprocess
 import sys
 import time
@@ -73,6 +83,11 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -83,13 +98,25 @@ OUTPUT_BASE_DIR = "generated_sketches"  # Base directory for all sketches
 
 # LLM Configuration
 USE_LOCAL_MODEL = True  # Set to False to use OpenAI API
-MODEL_NAME = "codellama:7b-code"  # Ollama model name
+MODEL_NAME = "codellama:7b-code-q4_0"  # Ollama model name (4-bit quantized)
 OLLAMA_API_URL = "http://localhost:11434/api/generate"  # Ollama API endpoint
+OLLAMA_NUM_THREAD = int(os.environ.get("OLLAMA_NUM_THREAD", os.cpu_count() or 1))
+OLLAMA_NUM_CTX = 2048  # Context window (prompt + generated sketch), Ollama's usual default
 
 # OpenAI Configuration (if USE_LOCAL_MODEL = False)
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "your-api-key-here")
 OPENAI_MODEL = "gpt-4"
 
+# Optional OpenAI-compatible server (e.g. vLLM) running an INT8 W8A8 model.
+# When set, it is used instead of the OpenAI API.
+INT8_BACKEND_URL = os.environ.get("INT8_BACKEND_URL")  # e.g. "http://localhost:8000/v1"
+INT8_BACKEND_MODEL = "neuralmagic/granite-3.1-2b-instruct-quantized.w8a8"
+
+# Dependency check cache (skips the ollama/applab probes on quick restarts).
+# Only written when every dependency, including the App Lab CLI, was found.
+DEPS_CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "uno-q-deps-ok.json"
+DEPS_CACHE_TTL_SECONDS = 3600
+
 # Safety configuration
 SAFETY_KEYWORDS = [
     "EEPROM.write",  # Avoid excessive EEPROM writes
@@ -103,35 +130,46 @@ SAFETY_KEYWORDS = [
 MAX_SKETCH_LINES = 100  # Maximum lines of code
 SAFE_PINS = [2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]  # Safe digital pins to use
 
+# Precompiled patterns (built once instead of on every sketch)
+_CODE_BLOCK_RE = re.compile(r"```(?:cpp|c|arduino)?\s*\n(.*?)\n```", re.DOTALL)
+_CODE_FENCE_RE = re.compile(r"```(?:cpp|c|arduino)?\s*\n")  # Opening line of _CODE_BLOCK_RE
+_WHILE_RE = re.compile(r"while\s*\([^)]+\)\s*\{[^}]*\}", re.DOTALL)
+_DANGER_RE = re.compile("|".join(map(re.escape, SAFETY_KEYWORDS)))
+_DANGER_MAX_LEN = max(map(len, SAFETY_KEYWORDS))
+_UNFENCED_LINE_TOLERANCE = 10  # Extra lines allowed before any ``` fence while streaming
+
+# Import only the client library for the selected backend (openai alone
+# adds tens of MB and a noticeable startup delay on the UNO Q)
+if USE_LOCAL_MODEL:
+    import aiohttp
+else:
+    from openai import AsyncOpenAI
+
 # ============================================================================
 # LLM INTERACTION FUNCTIONS
 # ============================================================================
 
-def generate_sketch_prompt():
-    """Create a prompt for the LLM to generate an Arduino sketch."""
-    
-    sketch_types = [
-        "LED blink pattern with varying speeds",
-        "LED chaser pattern across multiple pins",
-        "LED brightness fade using PWM",
-        "Random LED pattern",
-        "Binary counter display using LEDs",
-        "Knight Rider style LED sweep",
-        "Morse code SOS pattern",
-        "Traffic light simulation",
-        "LED breathing effect",
-        "Simple LED game pattern"
-    ]
-    
-    # Pick a random sketch type
-    import random
-    sketch_type = random.choice(sketch_types)
-    
-    prompt = f"""Generate a complete Arduino sketch that implements: {sketch_type}
+SKETCH_TYPES = (
+    "LED blink pattern with varying speeds",
+    "LED chaser pattern across multiple pins",
+    "LED brightness fade using PWM",
+    "Random LED pattern",
+    "Binary counter display using LEDs",
+    "Knight Rider style LED sweep",
+    "Morse code SOS pattern",
+    "Traffic light simulation",
+    "LED breathing effect",
+    "Simple LED game pattern"
+)
+
+# The prompt is built once. Everything except the sketch type is a fixed
+# prefix, so Ollama can reuse its cached prefix from the previous cycle.
+_SAFE_PINS_STR = ", ".join(map(str, SAFE_PINS))
+_PROMPT_PREFIX = f"""Generate a complete Arduino sketch.
 
 Requirements:
 - Must be a complete, valid Arduino sketch with setup() and loop() functions
-- Only use digital pins: {', '.join(map(str, SAFE_PINS))}
+- Only use digital pins: {_SAFE_PINS_STR}
 - Include comments explaining what the code does
 - Keep it under {MAX_SKETCH_LINES} lines
 - Use only standard Arduino functions (digitalWrite, pinMode, delay, analogWrite, millis)
@@ -140,47 +178,177 @@ Requirements:
 - Include appropriate delays to make effects visible
 - Must be safe and non-destructive
 
-Generate ONLY the Arduino code, no explanations before or after the code."""
-    
-    return prompt
+Generate ONLY the Arduino code, inside a single ```cpp code block, with no explanations before or after it.
+
+The sketch should implement: """
+_PROMPT_PREFIX_TOKENS = len(_PROMPT_PREFIX) // 4  # Rough estimate, ~4 characters per token
 
-def query_ollama(prompt: str) -> str:
-    """Query local Ollama model for code generation."""
+# Prompt + generated tokens must fit in OLLAMA_NUM_CTX, otherwise Ollama
+# shifts the context and drops the start of the sketch being written. So
+# generation is capped at the window minus the prompt (the prefix plus a
+# margin for the sketch type and the token estimate being rough).
+_PROMPT_MARGIN_TOKENS = 64
+_OLLAMA_NUM_PREDICT = min(
+    MAX_SKETCH_LINES * 12,  # ~12 tokens per line
+    OLLAMA_NUM_CTX - _PROMPT_PREFIX_TOKENS - _PROMPT_MARGIN_TOKENS
+)
+
+def generate_sketch_prompt():
+    """Create a prompt for the LLM to generate an Arduino sketch."""
+    return _PROMPT_PREFIX + random.choice(SKETCH_TYPES)
+
+def _json_dumps(obj, pretty: bool = False) -> bytes:
+    """Encode obj as UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None).encode()
+
+def _json_loads(data):
+    """Decode JSON from bytes or str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Everything in the Ollama request except the prompt is fixed, so it is
+# encoded once and only the prompt is encoded per call
+_OLLAMA_PAYLOAD_BASE = {
+    "model": MODEL_NAME,
+    "stream": True,  # Tokens arrive as newline-delimited JSON chunks
+    "options": {
+        "temperature": 0.8,  # Some creativity
+        "num_thread": OLLAMA_NUM_THREAD,
+        "num_ctx": OLLAMA_NUM_CTX,
+        "num_predict": _OLLAMA_NUM_PREDICT,
+        "num_keep": _PROMPT_PREFIX_TOKENS  # Keep the fixed prompt prefix in context
+    }
+}
+_OLLAMA_PAYLOAD_HEAD = _json_dumps(_OLLAMA_PAYLOAD_BASE)[:-1] + b',"prompt":'
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Long-lived clients, created on first use and reused every cycle so the
+# HTTP connection is kept alive between sketches
+_ollama_session = None
+_openai_client = None
+
+def _get_ollama_session():
+    """Return the shared aiohttp session for Ollama (must be called inside the event loop)."""
+    global _ollama_session
+    if _ollama_session is None or _ollama_session.closed:
+        # Fail fast if Ollama is not accepting connections, but allow
+        # up to 60 seconds between streamed chunks while it generates
+        timeout = aiohttp.ClientTimeout(total=None, connect=5, sock_read=60)
+        _ollama_session = aiohttp.ClientSession(timeout=timeout)
+    return _ollama_session
+
+def _get_openai_client():
+    """Return the shared OpenAI (or INT8 backend) client."""
+    global _openai_client
+    if _openai_client is None:
+        if INT8_BACKEND_URL:
+            _openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, base_url=INT8_BACKEND_URL)
+        else:
+            _openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _openai_client
+
+async def close_llm_clients():
+    """Close the shared LLM clients."""
+    if _ollama_session is not None:
+        await _ollama_session.close()
+    if _openai_client is not None:
+        await _openai_client.close()
+
+async def query_ollama(prompt: str) -> str:
+    """Query local Ollama model for code generation, streaming the response."""
     try:
-        import requests
-        
-        payload = {
-            "model": MODEL_NAME,
-            "prompt": prompt,
-            "stream": False,
-            "temperature": 0.8,  # Some creativity
-            "max_tokens": 1000
-        }
+        payload = _OLLAMA_PAYLOAD_HEAD + _json_dumps(prompt) + b"}"
         
         print(f"🤖 Querying local Ollama model: {MODEL_NAME}...")
-        response = requests.post(OLLAMA_API_URL, json=payload, timeout=60)
-        
-        if response.status_code == 200:
-            result = response.json()
-            return result.get("response", "")
-        else:
-            print(f"❌ Ollama API error: {response.status_code}")
-            return None
+        session = _get_ollama_session()
+        async with session.post(OLLAMA_API_URL, data=payload, headers=_JSON_HEADERS) as response:
+            if response.status != 200:
+                print(f"❌ Ollama API error: {response.status}")
+                return None
+            
+            # Assemble the response incrementally as chunks stream in, and
+            # stop generating as soon as the sketch can no longer pass
+            # validate_sketch_safety (saves the rest of the generation time).
+            # Only the first code block is validated later (see
+            # extract_code_from_markdown), so text around it is not checked.
+            #
+            # Until a fence appears the text may still be prose before a
+            # later block, so only a loose line cap applies. Keywords in
+            # unfenced output (e.g. bare code from a completion model that
+            # ignored the prompt) are only caught by validate_sketch_safety
+            # once generation has finished.
+            text = ""
+            code_start = None  # Where the code inside the first ``` block begins
+            line_count = 0
+            unfenced_lines = 1
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                chunk = _json_loads(line)
+                prev_len = len(text)
+                text += chunk.get("response", "")
+                
+                if code_start is None:
+                    fence = _CODE_FENCE_RE.search(text)
+                    if fence:
+                        code_start = prev_len = fence.end()
+                        line_count = 1
+                    else:
+                        unfenced_lines += text.count("\n", prev_len)
+                        # Only a fence after this many lines of prose could still
+                        # produce a passing sketch, so this is safe to abort on
+                        if unfenced_lines > MAX_SKETCH_LINES + _UNFENCED_LINE_TOLERANCE:
+                            response.close()
+                            print(f"⚠️  Stopped generation early: more than {MAX_SKETCH_LINES} lines")
+                            return None
+                
+                if code_start is not None:
+                    closing = text.find("\n```", max(code_start, prev_len - 3))
+                    code_end = closing if closing >= 0 else len(text)
+                    
+                    # Rescan a keyword's length back so matches split across chunks are found
+                    scan_from = max(code_start, prev_len - _DANGER_MAX_LEN + 1)
+                    match = _DANGER_RE.search(text, scan_from, code_end)
+                    if match:
+                        response.close()  # Drops the connection, so Ollama stops generating
+                        print(f"⚠️  Stopped generation early: contains dangerous keyword: {match.group(0)}")
+                        return None
+                    
+                    # The running count can include blank lines that are stripped
+                    # later, so confirm with an exact count before aborting
+                    line_count += text.count("\n", prev_len, code_end)
+                    if line_count > MAX_SKETCH_LINES:
+                        exact = text[code_start:code_end].strip().count("\n") + 1
+                        if exact > MAX_SKETCH_LINES:
+                            response.close()
+                            print(f"⚠️  Stopped generation early: more than {MAX_SKETCH_LINES} lines")
+                            return None
+                    
+                    if closing >= 0:
+                        # The first code block is complete and nothing after it is used
+                        response.close()
+                        return text
+                
+                if chunk.get("done"):
+                    break
+            return text
             
     except Exception as e:
         print(f"❌ Error querying Ollama: {e}")
         return None
 
-def query_openai(prompt: str) -> str:
+async def query_openai(prompt: str) -> str:
     """Query OpenAI API for code generation."""
     try:
-        from openai import OpenAI
-        
-        client = OpenAI(api_key=OPENAI_API_KEY)
+        client = _get_openai_client()
+        model = INT8_BACKEND_MODEL if INT8_BACKEND_URL else OPENAI_MODEL
         
-        print(f"🤖 Querying OpenAI model: {OPENAI_MODEL}...")
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL,
+        print(f"🤖 Querying OpenAI model: {model}...")
+        response = await client.chat.completions.create(
+            model=model,
             messages=[
                 {"role": "system", "content": "You are an Arduino code generator. Generate only valid Arduino C++ code with no explanations."},
                 {"role": "user", "content": prompt}
@@ -195,14 +363,14 @@ def query_openai(prompt: str) -> str:
         print(f"❌ Error querying OpenAI: {e}")
         return None
 
-def generate_sketch_with_llm() -> str:
+async def generate_sketch_with_llm() -> str:
     """Generate an Arduino sketch using the configured LLM."""
     prompt = generate_sketch_prompt()
     
     if USE_LOCAL_MODEL:
-        code = query_ollama(prompt)
+        code = await query_ollama(prompt)
     else:
-        code = query_openai(prompt)
+        code = await query_openai(prompt)
     
     if code:
         # Extract code from markdown code blocks if present
@@ -213,12 +381,11 @@ def generate_sketch_with_llm() -> str:
 
 def extract_code_from_markdown(text: str) -> str:
     """Extract Arduino code from markdown code blocks."""
-    # Look for code blocks
-    code_block_pattern = r"```(?:cpp|c|arduino)?\s*\n(.*?)\n```"
-    matches = re.findall(code_block_pattern, text, re.DOTALL)
+    # Look for code blocks (only the first one is used)
+    match = _CODE_BLOCK_RE.search(text)
     
-    if matches:
-        return matches[0].strip()
+    if match:
+        return match.group(1).strip()
     
     # If no code blocks, return the text as-is
     return text.strip()
@@ -230,10 +397,12 @@ def extract_code_from_markdown(text: str) -> str:
 def validate_sketch_safety(code: str) -> tuple[bool, str]:
     """Check if generated sketch is safe to deploy."""
     
-    # Check for dangerous keywords
-    for keyword in SAFETY_KEYWORDS:
-        if keyword in code:
-            return False, f"Contains dangerous keyword: {keyword}"
+    # Cheapest checks first, the regex scans only once these have passed
+    
+    # Check line count
+    line_count = code.count('\n') + 1
+    if line_count > MAX_SKETCH_LINES:
+        return False, f"Too many lines: {line_count} (max: {MAX_SKETCH_LINES})"
     
     # Check if it has required functions
     if "void setup()" not in code and "void setup ()" not in code:
@@ -242,16 +411,15 @@ def validate_sketch_safety(code: str) -> tuple[bool, str]:
     if "void loop()" not in code and "void loop ()" not in code:
         return False, "Missing loop() function"
     
-    # Check line count
-    line_count = len(code.split('\n'))
-    if line_count > MAX_SKETCH_LINES:
-        return False, f"Too many lines: {line_count} (max: {MAX_SKETCH_LINES})"
+    # Check for dangerous keywords (one pass over the code for all of them)
+    match = _DANGER_RE.search(code)
+    if match:
+        return False, f"Contains dangerous keyword: {match.group(0)}"
     
     # Check for while loops without delays (potential hang)
-    while_pattern = r"while\s*\([^)]+\)\s*{[^}]*}"
-    while_matches = re.findall(while_pattern, code, re.DOTALL)
-    for match in while_matches:
-        if "delay" not in match.lower() and "millis" not in match.lower():
+    for match in _WHILE_RE.finditer(code):
+        body = match.group(0).lower()
+        if "delay" not in body and "millis" not in body:
             return False, "Contains while loop without delay (potential hang)"
     
     return True, "Safe"
@@ -260,44 +428,68 @@ def validate_sketch_safety(code: str) -> tuple[bool, str]:
 # SKETCH DEPLOYMENT
 # ============================================================================
 
-def create_sketch_directory(sketch_number: int) -> Path:
-    """Create a directory for the generated sketch."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+# Static App Lab files, encoded once
+_COMPOSE_B = b"version: '3.8'\nservices:\n  # No additional services needed\n"
+_INIT_B = b"# ML-generated sketch\n"
+
+def create_sketch_directory(sketch_number: int, now: datetime) -> Path:
+    """Create a directory (and its sketch/ subdirectory) for the generated sketch."""
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     dir_name = f"sketch_{sketch_number:04d}_{timestamp}"
     sketch_dir = Path(OUTPUT_BASE_DIR) / dir_name
-    sketch_dir.mkdir(parents=True, exist_ok=True)
+    (sketch_dir / "sketch").mkdir(parents=True, exist_ok=True)
     return sketch_dir
 
-def write_sketch_files(sketch_dir: Path, code: str, sketch_number: int):
-    """Write the Arduino sketch and metadata to disk."""
-    
-    # Create sketch subdirectory
-    sketch_subdir = sketch_dir / "sketch"
-    sketch_subdir.mkdir(exist_ok=True)
+def write_files(base_dir: Path, files: dict[str, bytes]):
+    """Atomically write pre-encoded files relative to base_dir.
     
-    # Write Arduino sketch
-    sketch_file = sketch_subdir / "sketch.ino"
-    sketch_file.write_text(code)
-    print(f"✅ Written sketch to: {sketch_file}")
+    Each file is written to a temporary name and then renamed over the
+    target, so an interrupted run never leaves a half-written file behind
+    for the next applab deploy.
+    """
+    for rel_path, data in files.items():
+        path = base_dir / rel_path
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                # os.write may write less than asked (disk full, signals)
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+def write_sketch_files(sketch_dir: Path, code: str, sketch_number: int, now: datetime):
+    """Write the Arduino sketch and metadata to disk."""
     
     # Write metadata
     metadata = {
         "sketch_number": sketch_number,
-        "generated_at": datetime.now().isoformat(),
-        "model": MODEL_NAME if USE_LOCAL_MODEL else OPENAI_MODEL,
+        "generated_at": now.isoformat(),
+        "model": MODEL_NAME if USE_LOCAL_MODEL else (INT8_BACKEND_MODEL if INT8_BACKEND_URL else OPENAI_MODEL),
         "local_model": USE_LOCAL_MODEL,
         "line_count": len(code.split('\n'))
     }
     
-    metadata_file = sketch_dir / "metadata.json"
-    metadata_file.write_text(json.dumps(metadata, indent=2))
+    # Write Arduino sketch and metadata (sketch/ was made by create_sketch_directory)
+    write_files(sketch_dir, {
+        "sketch/sketch.ino": code.encode(),
+        "metadata.json": _json_dumps(metadata, pretty=True)
+    })
+    sketch_file = sketch_dir / "sketch" / "sketch.ino"
+    print(f"✅ Written sketch to: {sketch_file}")
     
     # Write App Lab configuration files
-    write_applab_config(sketch_dir, sketch_number)
+    write_applab_config(sketch_dir, sketch_number, now)
     
     return sketch_file
 
-def write_applab_config(sketch_dir: Path, sketch_number: int):
+def write_applab_config(sketch_dir: Path, sketch_number: int, now: datetime):
     """Write App Lab configuration files."""
     
     # brick_config.yaml
@@ -306,48 +498,51 @@ version: "1.0.0"
 description: "AI-generated Arduino sketch #{sketch_number}"
 author: "ML Generator"
 """
-    (sketch_dir / "brick_config.yaml").write_text(config)
-    
-    # brick_compose.yaml
-    compose = """version: '3.8'
-services:
-  # No additional services needed
-"""
-    (sketch_dir / "brick_compose.yaml").write_text(compose)
-    
-    # __init__.py
-    (sketch_dir / "__init__.py").write_text("# ML-generated sketch\n")
     
     # README.md
     readme = f"""# ML-Generated Sketch #{sketch_number}
 
 Auto-generated by ML sketch generator.
 
-Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+Generated: {now.strftime("%Y-%m-%d %H:%M:%S")}
 """
-    (sketch_dir / "README.md").write_text(readme)
+    
+    write_files(sketch_dir, {
+        "brick_config.yaml": config.encode(),
+        "brick_compose.yaml": _COMPOSE_B,
+        "__init__.py": _INIT_B,
+        "README.md": readme.encode()
+    })
 
-def deploy_sketch(sketch_dir: Path):
+async def deploy_sketch(sketch_dir: Path):
     """Attempt to deploy the sketch using App Lab CLI."""
     try:
-        result = subprocess.run(
-            ["applab", "deploy", str(sketch_dir.absolute())],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False
+        process = await asyncio.create_subprocess_exec(
+            "applab", "deploy", str(sketch_dir.absolute()),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
         )
         
-        if result.returncode == 0:
-            print("✅ Successfully deployed to STM32!")
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout=30)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            print("⚠️  Deployment timed out")
+            return False
+        except asyncio.CancelledError:
+            # Don't leave applab running when the generator is stopped
+            process.kill()
+            await process.wait()
+            raise
+        
+        if process.returncode == 0:
+            print(f"✅ Successfully deployed {sketch_dir.name} to STM32!")
             return True
         else:
-            print(f"⚠️  Deployment failed: {result.stderr}")
+            print(f"⚠️  Deployment failed: {stderr.decode(errors='replace')}")
             return False
-            
-    except subprocess.TimeoutExpired:
-        print("⚠️  Deployment timed out")
-        return False
+
     except Exception as e:
         print(f"⚠️  Could not deploy: {e}")
         return False
@@ -356,8 +551,26 @@ def deploy_sketch(sketch_dir: Path):
 # MAIN LOOP
 # ============================================================================
 
+def _deps_cache_key() -> dict:
+    """Settings that a cached dependency check is only valid for."""
+    return {"local_model": USE_LOCAL_MODEL, "model": MODEL_NAME}
+
+def _deps_cache_fresh() -> bool:
+    """True if a recent successful dependency check for this config exists."""
+    try:
+        if time.time() - DEPS_CACHE_FILE.stat().st_mtime >= DEPS_CACHE_TTL_SECONDS:
+            return False
+        cached = json.loads(DEPS_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return False
+    return cached.get("key") == _deps_cache_key()
+
 def check_dependencies():
     """Check if required dependencies are available."""
+    if _deps_cache_fresh():
+        print(f"✅ Dependencies checked within the last {DEPS_CACHE_TTL_SECONDS} seconds (cache: {DEPS_CACHE_FILE})")
+        return True
+    
     print("🔍 Checking dependencies...")
     
     # Check Ollama
@@ -371,7 +584,12 @@ def check_dependencies():
             )
             if result.returncode == 0:
                 print("✅ Ollama is installed")
-                if MODEL_NAME in result.stdout.decode():
+                # Compare the NAME column exactly so e.g. "codellama:7b-code"
+                # does not count as the quantized "codellama:7b-code-q4_0".
+                # A name without a tag is listed by Ollama as "name:latest".
+                wanted = MODEL_NAME if ":" in MODEL_NAME else MODEL_NAME + ":latest"
+                installed = [line.split()[0] for line in result.stdout.splitlines()[1:] if line.strip()]
+                if wanted.encode() in installed:
                     print(f"✅ Model '{MODEL_NAME}' is available")
                 else:
                     print(f"⚠️  Model '{MODEL_NAME}' not found. Download with:")
@@ -392,16 +610,45 @@ def check_dependencies():
             timeout=5,
             check=False
         )
-        if result.returncode == 0:
-            print("✅ App Lab CLI is available")
-        else:
-            print("⚠️  App Lab CLI not found (sketches will be saved but not deployed)")
+        applab_ok = result.returncode == 0
     except:
+        applab_ok = False
+    
+    if not applab_ok:
+        # Not cached, so the warning shows again on the next start
         print("⚠️  App Lab CLI not found (sketches will be saved but not deployed)")
+        return True
+    
+    print("✅ App Lab CLI is available")
+    try:
+        DEPS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        write_files(DEPS_CACHE_FILE.parent, {
+            DEPS_CACHE_FILE.name: _json_dumps({"key": _deps_cache_key(), "checked_at": time.time()})
+        })
+    except OSError:
+        pass  # Caching is only an optimisation
     
     return True
 
-def main():
+async def wait_for_next_cycle(deadline: float) -> float:
+    """Sleep until the monotonic deadline and return the following one.
+    
+    Cycles start on a fixed GENERATION_INTERVAL_SECONDS grid, so the time
+    spent generating and deploying no longer adds to the interval.
+    """
+    now = time.monotonic()
+    remaining = deadline - now
+    if remaining > 0:
+        print(f"\n⏳ Waiting {remaining:.0f} seconds until next sketch...")
+        await asyncio.sleep(remaining)
+        return deadline + GENERATION_INTERVAL_SECONDS
+    
+    # Skip the grid slots already missed instead of running them back to back
+    print(f"\n⚠️  Cycle overran by {-remaining:.1f} seconds, starting next sketch now")
+    missed = int(-remaining // GENERATION_INTERVAL_SECONDS) + 1
+    return deadline + missed * GENERATION_INTERVAL_SECONDS
+
+async def main():
     """Main generation loop."""
     print("=" * 70)
     print("Arduino UNO Q - ML-Powered Random Sketch Generator")
@@ -413,6 +660,8 @@ def main():
     print(f"  - Using local model: {USE_LOCAL_MODEL}")
     if USE_LOCAL_MODEL:
         print(f"  - Model: {MODEL_NAME}")
+    elif INT8_BACKEND_URL:
+        print(f"  - Model: {INT8_BACKEND_MODEL} ({INT8_BACKEND_URL})")
     else:
         print(f"  - Model: {OPENAI_MODEL}")
     print()
@@ -427,6 +676,8 @@ def main():
     print(f"   Press Ctrl+C to stop\n")
     
     sketch_number = 1
+    deploy_task = None  # Deployment of the previous sketch runs while the next one generates
+    deadline = time.monotonic() + GENERATION_INTERVAL_SECONDS
     
     try:
         while True:
@@ -435,11 +686,11 @@ def main():
             print("=" * 70)
             
             # Generate sketch with LLM
-            code = generate_sketch_with_llm()
+            code = await generate_sketch_with_llm()
             
             if not code:
                 print("❌ Failed to generate sketch, will retry next cycle")
-                time.sleep(GENERATION_INTERVAL_SECONDS)
+                deadline = await wait_for_next_cycle(deadline)
                 continue
             
             print(f"✅ Generated {len(code.split(chr(10)))} lines of code")
@@ -450,18 +701,23 @@ def main():
             if not is_safe:
                 print(f"⚠️  Sketch failed safety check: {reason}")
                 print(f"   Skipping this sketch, will try again next cycle")
-                time.sleep(GENERATION_INTERVAL_SECONDS)
+                deadline = await wait_for_next_cycle(deadline)
                 continue
             
             print("✅ Sketch passed safety checks")
             
-            # Create directory and write files
-            sketch_dir = create_sketch_directory(sketch_number)
-            write_sketch_files(sketch_dir, code, sketch_number)
+            # Create directory and write files, all stamped with the same time
+            now = datetime.now()
+            sketch_dir = create_sketch_directory(sketch_number, now)
+            write_sketch_files(sketch_dir, code, sketch_number, now)
+            
+            # Only one deployment at a time: finish the previous one first
+            if deploy_task is not None:
+                await deploy_task
             
-            # Deploy to STM32
+            # Deploy to STM32 in the background
             print(f"\n🚀 Deploying sketch #{sketch_number}...")
-            deploy_sketch(sketch_dir)
+            deploy_task = asyncio.create_task(deploy_sketch(sketch_dir))
             
             print(f"\n✨ Sketch #{sketch_number} complete!")
             print(f"📂 Files saved to: {sketch_dir.absolute()}")
@@ -469,13 +725,22 @@ def main():
             sketch_number += 1
             
             # Wait for next cycle
-            print(f"\n⏳ Waiting {GENERATION_INTERVAL_SECONDS} seconds until next sketch...")
-            time.sleep(GENERATION_INTERVAL_SECONDS)
+            deadline = await wait_for_next_cycle(deadline)
             
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        if deploy_task is not None and not deploy_task.done():
+            deploy_task.cancel()
+            # Let deploy_sketch kill the applab child before exiting
+            await asyncio.gather(deploy_task, return_exceptions=True)
         print("\n\n👋 Stopped by user")
         print(f"Generated {sketch_number - 1} sketches total")
         print(f"All sketches saved in: {Path(OUTPUT_BASE_DIR).absolute()}")
+        raise
+    finally:
+        await close_llm_clients()
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass